@@ -6,33 +6,147 @@ This script uses AAP API 2.3 to retrieve organization details and dependencies.
 """
 
 import requests
+import asyncio
+import hashlib
 import json
+import os
 import sys
 import argparse
-from urllib.parse import urljoin
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from urllib.parse import urlencode
 from getpass import getpass
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional dependency for AsyncAAPClient (HTTP/2 multiplexing)
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Optional dependency for faster JSON export serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Shared executor for paginated fetches so page requests can overlap
+# without creating a new pool per call
+_page_executor = ThreadPoolExecutor(max_workers=8)
+
+# Related resources checked for organizational dependencies, in display order
+RESOURCE_TYPES = (
+    ('teams', 'Teams'),
+    ('users', 'Users'),
+    ('projects', 'Projects'),
+    ('inventories', 'Inventories'),
+    ('job_templates', 'Job Templates'),
+    ('workflow_job_templates', 'Workflow Job Templates'),
+    ('credentials', 'Credentials'),
+    ('notification_templates', 'Notification Templates'),
+    ('instance_groups', 'Instance Groups'),
+    ('applications', 'Applications'),
+    ('activity_stream', 'Activity Stream'),
+    ('access_list', 'Access List'),
+)
+RESOURCE_LABELS = dict(RESOURCE_TYPES)
+
+# Compact per-row record for dependency entries: roughly half the memory
+# of a per-item dict, with tuple-indexed attribute access
+ItemRow = namedtuple('ItemRow', 'id name')
+
+
+class AAPError(Exception):
+    """Raised when an AAP API request fails"""
+
+    def __init__(self, url, status=None, body=None):
+        self.url = url
+        self.status = status
+        self.body = body
+        message = f"Request to {url} failed"
+        if status is not None:
+            message = f"{message} with status {status}"
+        super().__init__(message)
+
+
+def _to_jsonable(obj):
+    """Recursively convert ItemRow entries to plain dicts for export"""
+    if isinstance(obj, ItemRow):
+        return obj._asdict()
+    if isinstance(obj, dict):
+        return {key: _to_jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_jsonable(value) for value in obj]
+    return obj
+
 
 class AAPClient:
     """Client for interacting with Ansible Automation Platform API 2.3"""
     
-    def __init__(self, base_url, username, password, verify_ssl=True):
+    def __init__(self, base_url, username, password, verify_ssl=True,
+                 cache_ttl=30, disk_cache=False, cache_fallback=False,
+                 timeout=(5, 30)):
         """
         Initialize AAP client
-        
+
         Args:
             base_url: Base URL of AAP instance (e.g., https://aap.example.com)
             username: AAP username
             password: AAP password
             verify_ssl: Whether to verify SSL certificates
+            cache_ttl: Seconds to serve repeated GETs of the same
+                endpoint from memory (0 disables caching)
+            disk_cache: Persist responses to disk and revalidate them
+                with If-None-Match on later runs
+            cache_fallback: Serve stale cached responses when the
+                controller is unreachable (implies disk_cache)
+            timeout: (connect, read) timeout in seconds for every request
         """
         self.base_url = base_url.rstrip('/')
-        self.api_base = f"{self.base_url}/api/v2/"
+        self.timeout = timeout
+        self._api_marker = '/api/v2/'
+        # In-memory response cache: endpoint -> (data, fetch time)
+        self.cache_ttl = cache_ttl
+        self._get_cache = {}
+        # In-flight request registry so concurrent duplicate GETs share
+        # one network fetch instead of racing each other
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        # On-disk cache keyed by URL, holding the response body plus its
+        # ETag so unchanged data costs a 304 instead of a full download
+        self.cache_fallback = cache_fallback
+        self._disk_cache_dir = None
+        if disk_cache or cache_fallback:
+            self._disk_cache_dir = os.path.expanduser('~/.cache/aap_inspector')
+            os.makedirs(self._disk_cache_dir, exist_ok=True)
+        self.api_base = self.base_url + self._api_marker
         self.session = requests.Session()
         self.session.auth = (username, password)
         self.session.verify = verify_ssl
+        # Size the connection pool so concurrent requests can reuse
+        # connections instead of queueing behind the default pool of 10,
+        # and retry idempotent GETs on transient gateway errors rather
+        # than failing the whole inspection
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=['GET'],
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'Content-Type': 'application/json',
+            'Connection': 'keep-alive',
         })
     
     def get(self, endpoint):
@@ -41,21 +155,139 @@ class AAPClient:
         
         Args:
             endpoint: API endpoint (relative to /api/v2/)
-            
+
         Returns:
             Response JSON data
+
+        Raises:
+            AAPError: If the request fails after adapter-level retries
         """
-        url = urljoin(self.api_base, endpoint)
+        # Serve repeated reads of the same endpoint from memory while
+        # they are still fresh
+        cached = self._get_cache.get(endpoint)
+        if cached is not None:
+            data, fetched_at = cached
+            if monotonic() - fetched_at < self.cache_ttl:
+                return data
+
+        # Coalesce concurrent duplicates: the first caller performs the
+        # fetch, later callers for the same endpoint wait on its future
+        with self._inflight_lock:
+            future = self._inflight.get(endpoint)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[endpoint] = future
+        if not leader:
+            return future.result()
+
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json()
+            data = self._fetch(endpoint)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(endpoint, None)
+
+    def _fetch(self, endpoint):
+        """Perform the network GET for an endpoint, bypassing coalescing"""
+        # api_base is a fixed prefix and endpoints are always relative,
+        # so plain concatenation beats re-parsing both URLs via urljoin
+        url = self.api_base + endpoint.lstrip('/')
+        headers = None
+        disk_entry = None
+        if self._disk_cache_dir:
+            disk_entry = self._read_disk_cache(url)
+            if disk_entry and disk_entry.get('etag'):
+                headers = {'If-None-Match': disk_entry['etag']}
+
+        try:
+            # An explicit timeout keeps a hung connection from blocking
+            # forever and pinning a pool slot during the concurrent fan-out
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if disk_entry is not None and response.status_code == 304:
+                # Unchanged on the server; reuse the cached body
+                data = disk_entry['body']
+            else:
+                response.raise_for_status()
+                # orjson decodes in C, several times faster than the
+                # stdlib parser behind response.json(); both return
+                # plain dicts/lists so callers are unaffected
+                if orjson is not None:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
+                if self._disk_cache_dir:
+                    self._write_disk_cache(url, response.headers.get('ETag'), data)
+            self._get_cache[endpoint] = (data, monotonic())
+            return data
         except requests.exceptions.RequestException as e:
-            print(f"Error making request to {url}: {e}", file=sys.stderr)
-            if hasattr(e.response, 'text'):
-                print(f"Response: {e.response.text}", file=sys.stderr)
-            sys.exit(1)
-    
+            if self.cache_fallback and disk_entry is not None:
+                print(f"Warning: request to {url} failed ({e}); "
+                      f"serving stale cached data", file=sys.stderr)
+                return disk_entry['body']
+            # Raise instead of exiting so one flaky endpoint cannot
+            # abort an entire dependency scan; transient connection and
+            # gateway errors are already retried by the session adapter
+            raise AAPError(
+                url,
+                status=getattr(e.response, 'status_code', None),
+                body=getattr(e.response, 'text', None),
+            ) from e
+
+    def _cache_path(self, url):
+        """Return the disk cache filename for a URL"""
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self._disk_cache_dir, f"{digest}.json")
+
+    def _read_disk_cache(self, url):
+        """Load a cached response for a URL, or None if absent/corrupt"""
+        try:
+            with open(self._cache_path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk_cache(self, url, etag, body):
+        """Store a response body and its ETag for later revalidation"""
+        if not etag:
+            return
+        try:
+            with open(self._cache_path(url), 'w') as f:
+                json.dump({'etag': etag, 'body': body}, f)
+        except OSError:
+            pass
+
+    def get_with_params(self, endpoint, params):
+        """
+        Make GET request with URL-encoded query parameters
+
+        Args:
+            endpoint: API endpoint (relative to /api/v2/)
+            params: Dict of query parameters to encode
+
+        Returns:
+            Response JSON data
+        """
+        separator = '&' if '?' in endpoint else '?'
+        return self.get(f"{endpoint}{separator}{urlencode(params)}")
+
+    def invalidate(self, endpoint=None):
+        """
+        Drop cached responses
+
+        Args:
+            endpoint: Endpoint to evict, or None to clear the whole cache
+        """
+        if endpoint is None:
+            self._get_cache.clear()
+        else:
+            self._get_cache.pop(endpoint, None)
+
     def get_organizations(self):
         """Get all organizations"""
         return self.get('organizations/')
@@ -70,7 +302,7 @@ class AAPClient:
         Returns:
             Organization data or None if not found
         """
-        response = self.get(f'organizations/?name={org_name}')
+        response = self.get_with_params('organizations/', {'name': org_name})
         results = response.get('results', [])
         if results:
             return results[0]
@@ -88,19 +320,150 @@ class AAPClient:
         """
         return self.get(f'organizations/{org_id}/')
     
-    def get_related_data(self, related_url):
+    def get_all_pages(self, endpoint, page_size=200):
+        """
+        Get all results from a paginated list endpoint
+
+        Fetches the first page, then requests any remaining pages
+        concurrently and concatenates their results in page order.
+
+        Args:
+            endpoint: API endpoint (relative to /api/v2/)
+            page_size: Number of results to request per page
+
+        Returns:
+            Response JSON data with 'results' holding every page's rows
+        """
+        separator = '&' if '?' in endpoint else '?'
+        data = self.get(f"{endpoint}{separator}page_size={page_size}")
+        count = data.get('count', 0)
+
+        if count > page_size:
+            num_pages = -(-count // page_size)  # ceiling division
+            futures = [
+                _page_executor.submit(
+                    self.get, f"{endpoint}{separator}page_size={page_size}&page={page}"
+                )
+                for page in range(2, num_pages + 1)
+            ]
+            # Futures are submitted in page order, so collecting them in
+            # order keeps the concatenated results deterministic
+            results = list(data.get('results', []))
+            for future in futures:
+                results.extend(future.result().get('results', []))
+            # Copy before replacing results so the cached first-page
+            # response is not mutated in place
+            data = dict(data)
+            data['results'] = results
+
+        return data
+
+    def get_related_data(self, related_url, all_pages=False):
         """
         Get data from a related endpoint
-        
+
         Args:
             related_url: Full URL or relative path to related data
-            
+            all_pages: Whether to fetch every page of a paginated list
+
+        Returns:
+            Related data
+        """
+        # Related URLs almost always repeat this client's own API
+        # prefix, so a prefix-length slice covers the common cases
+        # without scanning the whole string
+        if related_url.startswith(self.api_base):
+            endpoint = related_url[len(self.api_base):]
+        elif related_url.startswith(self._api_marker):
+            endpoint = related_url[len(self._api_marker):]
+        elif related_url.startswith('http'):
+            parts = related_url.split(self._api_marker, 1)
+            if len(parts) < 2:
+                return None
+            endpoint = parts[1]
+        else:
+            endpoint = related_url.lstrip('/')
+
+        if all_pages:
+            return self.get_all_pages(endpoint)
+        return self.get(endpoint)
+
+
+class AsyncAAPClient:
+    """
+    Async client for AAP API 2.3 using HTTP/2 multiplexing
+
+    Unlike AAPClient, which overlaps requests across a pool of HTTP/1.1
+    connections, this client multiplexes all in-flight requests over a
+    single TCP+TLS connection, paying one handshake for the whole walk.
+
+    Requires the optional httpx dependency: pip install 'httpx[http2]'
+    """
+
+    def __init__(self, base_url, username, password, verify_ssl=True):
+        """
+        Initialize async AAP client
+
+        Args:
+            base_url: Base URL of AAP instance (e.g., https://aap.example.com)
+            username: AAP username
+            password: AAP password
+            verify_ssl: Whether to verify SSL certificates
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncAAPClient requires httpx; install it with: "
+                "pip install 'httpx[http2]'"
+            )
+        self.base_url = base_url.rstrip('/')
+        self.api_base = f"{self.base_url}/api/v2/"
+        self.client = httpx.AsyncClient(
+            base_url=self.api_base,
+            auth=(username, password),
+            verify=verify_ssl,
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            headers={'Content-Type': 'application/json'},
+        )
+
+    async def get(self, endpoint):
+        """
+        Make GET request to API endpoint
+
+        Args:
+            endpoint: API endpoint (relative to /api/v2/)
+
+        Returns:
+            Response JSON data
+        """
+        response = await self.client.get(endpoint)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_many(self, endpoints):
+        """
+        Fetch several endpoints concurrently over one connection
+
+        Args:
+            endpoints: Iterable of API endpoints (relative to /api/v2/)
+
+        Returns:
+            List of response JSON data, in the same order as endpoints
+        """
+        return await asyncio.gather(*(self.get(endpoint) for endpoint in endpoints))
+
+    async def get_related_data(self, related_url):
+        """
+        Get data from a related endpoint
+
+        Args:
+            related_url: Full URL or relative path to related data
+
         Returns:
             Related data
         """
         # If it's a full URL, extract the path after /api/v2/
         if related_url.startswith('http'):
-            # Extract path after /api/v2/
             parts = related_url.split('/api/v2/')
             if len(parts) > 1:
                 endpoint = parts[1]
@@ -108,8 +471,18 @@ class AAPClient:
                 return None
         else:
             endpoint = related_url.lstrip('/')
-        
-        return self.get(endpoint)
+
+        return await self.get(endpoint)
+
+    async def aclose(self):
+        """Close the underlying connection"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
 
 
 class OrganizationInspector:
@@ -124,21 +497,23 @@ class OrganizationInspector:
         """
         self.client = client
     
-    def inspect_organization(self, org_identifier):
+    def inspect_organization(self, org_identifier, export_full=False):
         """
         Inspect organization and find dependencies
-        
+
         Args:
             org_identifier: Organization name or ID
-            
+            export_full: Whether to fetch complete dependency lists
+                (all pages) for export, not just the first page
+
         Returns:
             Dictionary with organization details and dependencies
         """
-        # Try to get organization by name first, then by ID
-        try:
-            org_id = int(org_identifier)
-            org = self.client.get_organization_by_id(org_id)
-        except ValueError:
+        # Numeric identifiers are IDs, anything else is a name
+        org_identifier = str(org_identifier)
+        if org_identifier.isdigit():
+            org = self.client.get_organization_by_id(int(org_identifier))
+        else:
             org = self.client.get_organization_by_name(org_identifier)
         
         if not org:
@@ -153,7 +528,7 @@ class OrganizationInspector:
         self._display_org_details(org)
         
         # Find and display dependencies
-        dependencies = self._find_dependencies(org)
+        dependencies = self._find_dependencies(org, export_full=export_full)
         
         return {
             'organization': org,
@@ -177,13 +552,15 @@ class OrganizationInspector:
                 print(f"  {field:.<30} {value}")
         print()
     
-    def _find_dependencies(self, org):
+    def _find_dependencies(self, org, export_full=False):
         """
         Find organization dependencies
-        
+
         Args:
             org: Organization data
-            
+            export_full: Whether to fetch complete dependency lists
+                (all pages) instead of just the first page
+
         Returns:
             Dictionary of dependencies
         """
@@ -196,64 +573,87 @@ class OrganizationInspector:
         related_fields = org.get('related', {})
         summary_fields = org.get('summary_fields', {})
         
-        # Check for related organizations in various resources
-        resource_types = [
-            ('teams', 'Teams'),
-            ('users', 'Users'),
-            ('projects', 'Projects'),
-            ('inventories', 'Inventories'),
-            ('job_templates', 'Job Templates'),
-            ('workflow_job_templates', 'Workflow Job Templates'),
-            ('credentials', 'Credentials'),
-            ('notification_templates', 'Notification Templates'),
-            ('instance_groups', 'Instance Groups'),
-            ('applications', 'Applications'),
-            ('activity_stream', 'Activity Stream'),
-            ('access_list', 'Access List'),
+        # Resolve which resource types this org actually exposes once,
+        # then reuse the list for both dispatch and ordered rendering
+        to_fetch = [
+            (field, label) for field, label in RESOURCE_TYPES
+            if field in related_fields
         ]
-        
-        for field, label in resource_types:
-            if field in related_fields:
+
+        # Only id/name/username/organization are read from each row, so
+        # ask the server to project just those fields; heavy
+        # summary_fields and related maps stay off the wire. AAP
+        # versions that reject ?fields= get retried without it.
+        def fetch(related_url):
+            separator = '&' if '?' in related_url else '?'
+            projected = f"{related_url}{separator}fields=id,name,username,organization"
+            try:
+                return self.client.get_related_data(projected, all_pages=export_full)
+            except Exception:
+                return self.client.get_related_data(related_url, all_pages=export_full)
+
+        # Submit every fetch up front, then render in RESOURCE_TYPES
+        # order as each future resolves: while one resource is being
+        # printed the remaining downloads are still in flight, so the
+        # later .result() calls have usually already completed
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                field: executor.submit(fetch, related_fields[field])
+                for field, label in to_fetch
+            }
+
+            for field, label in to_fetch:
                 print(f"\n{label}:")
                 try:
-                    data = self.client.get_related_data(related_fields[field])
-                    count = data.get('count', 0)
-                    print(f"  Count: {count}")
-                    
-                    if count > 0 and 'results' in data:
-                        dependencies[field] = []
-                        # Show first few items
-                        for item in data['results'][:5]:
-                            name = item.get('name', item.get('username', 'N/A'))
-                            item_id = item.get('id', 'N/A')
-                            print(f"    - [{item_id}] {name}")
-                            dependencies[field].append({
-                                'id': item_id,
-                                'name': name
-                            })
-                        
-                        if count > 5:
-                            print(f"    ... and {count - 5} more")
+                    data = futures[field].result()
                 except Exception as e:
                     print(f"  Error retrieving {label}: {e}")
+                    continue
+
+                count = data.get('count', 0)
+                print(f"  Count: {count}")
+
+                if count > 0 and 'results' in data:
+                    # Record everything for export, but only show the first few
+                    items = data['results'] if export_full else data['results'][:5]
+                    rows = [
+                        ItemRow(item.get('id', 'N/A'),
+                                item.get('name') or item.get('username') or 'N/A')
+                        for item in items
+                    ]
+                    dependencies[field] = rows
+                    for row in rows[:5]:
+                        print(f"    - [{row.id}] {row.name}")
+
+                    if count > 5:
+                        print(f"    ... and {count - 5} more")
         
         # Check for galaxy credentials or other org-linked credentials
         if 'credentials' in dependencies:
             print(f"\nChecking credentials for cross-organization dependencies...")
-            for cred in dependencies['credentials']:
-                try:
-                    cred_detail = self.client.get(f"credentials/{cred['id']}/")
-                    cred_org_id = cred_detail.get('organization')
-                    if cred_org_id and cred_org_id != org['id']:
-                        print(f"  ⚠️  Credential '{cred['name']}' belongs to different organization (ID: {cred_org_id})")
-                        if 'cross_org_credentials' not in dependencies:
-                            dependencies['cross_org_credentials'] = []
-                        dependencies['cross_org_credentials'].append({
-                            'credential': cred,
-                            'organization_id': cred_org_id
-                        })
-                except Exception as e:
-                    print(f"  Error checking credential {cred['id']}: {e}")
+            # Push the comparison to the server: ask for just the rows
+            # whose organization differs from this org (and is set at
+            # all), so the whole check costs one request regardless of
+            # how many credentials the org has
+            try:
+                id_filter = ','.join(str(cred.id) for cred in dependencies['credentials'])
+                cross = self.client.get(
+                    f"credentials/?id__in={id_filter}"
+                    f"&not__organization={org['id']}"
+                    f"&organization__isnull=False&page_size=200"
+                )
+                for row in cross.get('results', []):
+                    cred = ItemRow(row['id'], row.get('name', 'N/A'))
+                    cred_org_id = row.get('organization')
+                    print(f"  ⚠️  Credential '{cred.name}' belongs to different organization (ID: {cred_org_id})")
+                    if 'cross_org_credentials' not in dependencies:
+                        dependencies['cross_org_credentials'] = []
+                    dependencies['cross_org_credentials'].append({
+                        'credential': cred,
+                        'organization_id': cred_org_id
+                    })
+            except Exception as e:
+                print(f"  Error checking credentials: {e}")
         
         print()
         return dependencies
@@ -266,8 +666,20 @@ class OrganizationInspector:
             data: Data to export
             filename: Output filename
         """
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        # ItemRow entries would otherwise serialize as bare arrays;
+        # convert them back to dicts so the export format is stable
+        data = _to_jsonable(data)
+        if orjson is not None:
+            # orjson serializes directly to bytes in C, several times
+            # faster than stdlib json and without the Python-level
+            # intermediate buffers
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump writes incrementally to the file handle rather
+            # than building the whole serialized string in memory
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
         print(f"\nData exported to: {filename}")
 
 
@@ -302,6 +714,16 @@ def main():
         '--export',
         help='Export results to JSON file'
     )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Cache API responses on disk and revalidate with ETags'
+    )
+    parser.add_argument(
+        '--cache-fallback',
+        action='store_true',
+        help='Serve stale cached data if the controller is unreachable (implies --cache)'
+    )
     
     args = parser.parse_args()
     
@@ -314,12 +736,23 @@ def main():
         base_url=args.url,
         username=username,
         password=password,
-        verify_ssl=not args.no_verify_ssl
+        verify_ssl=not args.no_verify_ssl,
+        disk_cache=args.cache,
+        cache_fallback=args.cache_fallback
     )
     
     # Create inspector and inspect organization
     inspector = OrganizationInspector(client)
-    result = inspector.inspect_organization(args.organization)
+    try:
+        result = inspector.inspect_organization(
+            args.organization,
+            export_full=bool(args.export)
+        )
+    except AAPError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if e.body:
+            print(f"Response: {e.body}", file=sys.stderr)
+        sys.exit(1)
     
     # Export if requested
     if args.export: